@@ -1,9 +1,15 @@
 import sys
 import os
+import math
 import time
 import threading
 import queue
 import signal
+import json
+import importlib.util
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -17,31 +23,77 @@ def qt_message_handler(mode, context, message):
 QtCore.qInstallMessageHandler(qt_message_handler)
 
 import cv2
+import numpy as np
 
+# MediaPipe / Ultralytics(torch) / pyttsx3 导入都要几秒，推迟到第一次真正用到时再加载，程序启动更快
 MP_IMPORT_ERROR = ""
 mp_face_mesh = None
+mp_face_detection = None
+mp = None
+mp_vision = None
+torch = None
+YOLO = None
+cpuinfo = None
+pyttsx3 = None
+_vision_lock = threading.Lock()
+_vision_loaded = False
+
+
+def load_vision_modules():
+    """首次启动监测时导入视觉相关的依赖，可重复调用"""
+    global MP_IMPORT_ERROR, mp_face_mesh, mp_face_detection, mp, mp_vision, torch, YOLO, cpuinfo, _vision_loaded
+    with _vision_lock:
+        if _vision_loaded:
+            return
+        _vision_loaded = True
 
-try:
-    import mediapipe as mp
-
-    if hasattr(mp, "solutions"):
-        mp_face_mesh = mp.solutions.face_mesh
-    else:
-        MP_IMPORT_ERROR = "MediaPipe加载不完整"
-except ImportError as e:
-    MP_IMPORT_ERROR = f"未安装 MediaPipe: {e}"
-except Exception as e:
-    MP_IMPORT_ERROR = f"MediaPipe 内部错误: {e}"
+        try:
+            import mediapipe as _mp
 
-try:
-    from ultralytics import YOLO
-except ImportError:
-    YOLO = None
+            mp = _mp
+            if hasattr(mp, "solutions"):
+                mp_face_mesh = mp.solutions.face_mesh
+                mp_face_detection = mp.solutions.face_detection
+            else:
+                MP_IMPORT_ERROR = "MediaPipe加载不完整"
+        except ImportError as e:
+            MP_IMPORT_ERROR = f"未安装 MediaPipe: {e}"
+        except Exception as e:
+            MP_IMPORT_ERROR = f"MediaPipe 内部错误: {e}"
+
+        # Tasks API (FaceLandmarker) 从 0.10 起才有，macOS 上的 mediapipe-silicon 没有
+        if mp:
+            try:
+                from mediapipe.tasks.python import vision as _mp_vision
+                mp_vision = _mp_vision
+            except Exception:
+                pass
 
-try:
-    import pyttsx3
-except ImportError:
-    pyttsx3 = None
+        try:
+            import torch as _torch
+            from ultralytics import YOLO as _YOLO
+            torch, YOLO = _torch, _YOLO
+            # 允许 FP32 矩阵乘法走 TF32 Tensor Core
+            torch.set_float32_matmul_precision("high")
+        except ImportError:
+            pass
+
+        try:
+            import cpuinfo as _cpuinfo
+            cpuinfo = _cpuinfo
+        except ImportError:
+            pass
+
+
+def load_pyttsx3():
+    """在语音线程里导入 pyttsx3，不阻塞主界面启动"""
+    global pyttsx3
+    try:
+        import pyttsx3 as _pyttsx3
+        pyttsx3 = _pyttsx3
+    except ImportError:
+        pyttsx3 = None
+    return pyttsx3
 
 
 def get_resource_path(relative_path):
@@ -51,6 +103,25 @@ def get_resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
+def open_camera(index):
+    """打开摄像头并切到 MJPG 压缩流，减少 USB 带宽和软件解码开销"""
+    # 显式指定各平台的原生后端；Windows 下 DirectShow 打开速度明显快于默认的 MSMF
+    if sys.platform == "win32":
+        backend = cv2.CAP_DSHOW
+    elif sys.platform.startswith("linux"):
+        backend = cv2.CAP_V4L2
+    elif sys.platform == "darwin":
+        backend = cv2.CAP_AVFOUNDATION
+    else:
+        backend = cv2.CAP_ANY
+    cap = cv2.VideoCapture(index, backend)
+    if cap.isOpened():
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        cap.set(cv2.CAP_PROP_FPS, 15)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
 @dataclass
 class AppConfig:
     focus_minutes: int = 25
@@ -61,7 +132,23 @@ class AppConfig:
     prompt_cooldown: int = 8
     enable_monitor: bool = True
     yolo_weights_path: str = "models/yolo11n.pt"
+    # auto / tensorrt / openvino_int8 / openvino / onnx / pytorch
+    yolo_backend: str = "auto"
     camera_index: int = 0
+    calib_dir: str = "calib"
+    use_face_mesh: bool = False
+    face_landmarker_path: str = "models/face_landmarker.task"
+
+
+MAIN_STYLE = """
+    QWidget { background-color: #fff6ef; color: #3d2b1f; font-family: "Microsoft YaHei UI"; font-size: 14px; }
+    #title { font-size: 22px; font-weight: bold; margin-bottom: 10px; }
+    QGroupBox { border: 1px solid #f0c6a8; border-radius: 8px; margin-top: 10px; padding-top: 15px; font-weight: bold; }
+    QLineEdit, QSpinBox, QComboBox { background: #fff1e8; border: 1px solid #f2b48f; border-radius: 5px; min-height: 30px; padding: 0 5px; }
+    QPushButton { background: #f08a5d; color: white; border-radius: 5px; min-height: 38px; font-weight: bold; }
+    QPushButton:disabled { background: #e0c0b0; color: #fff; }
+    #status { color: #d35400; font-weight: bold; margin-top: 5px; }
+"""
 
 
 # --- 悬浮窗组件 ---
@@ -76,28 +163,30 @@ class FloatingTimer(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.setFixedSize(240, 90)
         self._drag_offset = None
-
-        self.label = QtWidgets.QLabel("00:00", self)
-        self.label.setAlignment(QtCore.Qt.AlignCenter)
-        font = QtGui.QFont("Arial", 28, QtGui.QFont.Bold)
-        self.label.setFont(font)
-
-        self.status_label = QtWidgets.QLabel("", self)
-        self.status_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.status_label.setGeometry(0, 65, 240, 20)
-        self.status_label.setStyleSheet("color: #8a5a3a; font-size: 12px; font-weight: bold;")
-
-        layout = QtWidgets.QVBoxLayout(self)
-        layout.setContentsMargins(16, 16, 16, 16)
-        layout.addWidget(self.label)
+        self._bg = None
+        # 两行文字直接在 paintEvent 里画，不用 QLabel 和布局，每秒刷新只触发一次绘制
+        self._time_text = "00:00"
+        self._status_text = ""
+        self._time_font = QtGui.QFont("Arial", 28, QtGui.QFont.Bold)
+        self._status_font = QtGui.QFont()
+        self._status_font.setPixelSize(12)
+        self._status_font.setBold(True)
+        self._status_color = QtGui.QColor("#8a5a3a")
 
     def update_time(self, text: str, status_text: str = "") -> None:
-        self.label.setText(text)
+        changed = text != self._time_text or (status_text and status_text != self._status_text)
+        self._time_text = text
         if status_text:
-            self.status_label.setText(status_text)
-
-    def paintEvent(self, event):
-        painter = QtGui.QPainter(self)
+            self._status_text = status_text
+        if changed:
+            self.update()
+
+    def _render_background(self, dpr: float) -> QPixmap:
+        # 窗口尺寸固定，渐变圆角背景只需画一次，之后直接贴图
+        bg = QPixmap(self.size() * dpr)
+        bg.setDevicePixelRatio(dpr)
+        bg.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(bg)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
         rect = self.rect().adjusted(2, 2, -2, -2)
         gradient = QtGui.QLinearGradient(rect.topLeft(), rect.bottomRight())
@@ -106,6 +195,24 @@ class FloatingTimer(QtWidgets.QWidget):
         painter.setBrush(QtGui.QBrush(gradient))
         painter.setPen(QtGui.QPen(QtGui.QColor(186, 128, 98, 180), 1.5))
         painter.drawRoundedRect(rect, 16, 16)
+        painter.end()
+        return bg
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        # 拖到不同缩放比例的屏幕上时重新生成，保证高分屏下不发虚
+        if self._bg is None or self._bg.devicePixelRatio() != dpr:
+            self._bg = self._render_background(dpr)
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self._bg)
+        painter.setPen(self.palette().color(QtGui.QPalette.WindowText))
+        painter.setFont(self._time_font)
+        painter.drawText(self.rect().adjusted(16, 16, -16, -16), QtCore.Qt.AlignCenter, self._time_text)
+        if self._status_text:
+            painter.setPen(self._status_color)
+            painter.setFont(self._status_font)
+            painter.drawText(QtCore.QRect(0, 65, self.width(), 20), QtCore.Qt.AlignCenter, self._status_text)
+        painter.end()
 
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton:
@@ -126,32 +233,54 @@ class FloatingTimer(QtWidgets.QWidget):
 class VoicePrompter(QtCore.QObject):
     def __init__(self):
         super().__init__()
-        self._queue = queue.Queue()
+        # 只保留最新一条待播报内容，连续触发时不会积压过时的提醒
+        self._slot = None
+        self._cv = threading.Condition()
+        self._last_text = None
+        self._last_time = 0.0
+        self._engine = None
         self._thread = threading.Thread(target=self._speech_loop, daemon=True)
         self._thread.start()
 
     def speak(self, text: str) -> None:
         # print(f"[语音指令] 加入队列: {text}")
-        self._queue.put(text)
+        with self._cv:
+            now = time.time()
+            # 1 秒内重复的同一句话直接丢弃
+            if text == self._last_text and now - self._last_time < 1.0:
+                return
+            self._last_text = text
+            self._last_time = now
+            self._slot = text
+            self._cv.notify()
 
     def _speech_loop(self):
+        load_pyttsx3()
         while True:
-            text = self._queue.get()
-            if text is None: break
+            with self._cv:
+                self._cv.wait_for(lambda: self._slot is not None)
+                text, self._slot = self._slot, None
 
             if pyttsx3:
                 try:
-                    engine = pyttsx3.init()
-                    engine.setProperty('rate', 150)
-                    engine.say(text)
-                    engine.runAndWait()
-                    engine.stop()
-                    del engine
+                    if self._engine is None:
+                        self._engine = self._create_engine()
+                    self._engine.say(text)
+                    self._engine.runAndWait()
                 except Exception as e:
                     print(f"[语音错误] 播放失败: {e}")
+                    # 引擎出错后丢弃，下次播放时重建
+                    self._engine = None
             else:
                 pass
 
+    @staticmethod
+    def _create_engine():
+        # 引擎只在语音线程里创建并复用，避免每句话都重新初始化 SAPI/COM
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 150)
+        return engine
+
 
 # --- 自定义输入框 ---
 class SpinBoxWithButtons(QtWidgets.QWidget):
@@ -196,33 +325,110 @@ class CameraMonitor(QtCore.QThread):
     prompt_needed = QtCore.Signal(str)
     status = QtCore.Signal(str)
 
-    def __init__(self, config: AppConfig):
+    # 鼻尖、下巴、左右眼角，每个关键点只读一次 .y
+    _LM_IDX = (1, 152, 33, 263)
+    PHONE_NAMES = {"cell phone", "phone", "mobile phone"}
+    YOLO_IMGSZ = 416
+    YOLO_BACKENDS = ("tensorrt", "openvino_int8", "openvino", "onnx")
+
+    def __init__(self, config: AppConfig, cap=None):
         super().__init__()
         self._config = config
+        # 由主窗口传入的摄像头归主窗口管理，这里只用不释放
+        self._shared_cap = cap
         self._stop_flag = threading.Event()
+        self._frame_wanted = threading.Event()
+        # 休息阶段只暂停不退出，模型和摄像头都留着，下个专注阶段不用重新加载
+        self._active = threading.Event()
+        self._active.set()
+        self._frame_interval = 0.2
         self._last_prompt_time = 0.0
-        self._face_mesh = None
+        self._face_model = None
+        # 实际加载的是人脸检测模型还是关键点模型，两者的结果结构和阈值都不同
+        self._use_detection = False
+        self._landmarker = None
+        self._last_landmarker_ts = 0
         self._yolo = None
+        self._phone_cls_ids = set()
+        self._phone_cls_tensor = None
+        self._yolo_device = "cpu"
+        self._yolo_half = False
+        self._yolo_backend = None
         self._mp_error = None
+        self._rgb_buffer = None
+        self._frame_slots = [None, None]
+        self._slot_idx = 0
+        # 人脸区域（像素坐标 x0, y0, x1, y1），边距按人脸框大小的比例外扩
+        self._face_roi = None
+        self._roi_margin = 0.5
+        self._roi_refresh_every = 30
+        self._roi_frame_idx = 0
+        # 推理循环里不直接 print，先记到环形缓冲，线程退出时统一输出
+        self._log = deque(maxlen=200)
         self.HEAD_DOWN_THRESHOLD = 0.45
+        # 短距人脸检测没有下巴点，改用嘴部中心作分母，比例整体偏大
+        self.HEAD_DOWN_THRESHOLD_DETECTION = 0.67
+        # 开始监测后先取若干帧正常坐姿的比例作基线，摄像头位置、个人体态不同时阈值相应上调
+        self._head_down_threshold = self.HEAD_DOWN_THRESHOLD
+        self._baseline_ratios = []
+        self._baseline_frames = 10
+        self.FRAME_WIDTH = 640
+        self.FRAME_HEIGHT = 360
+        self.INFER_WIDTH = self.YOLO_IMGSZ
+        # YOLO 比 FaceMesh 重一个数量级，手机也不会在相邻帧间突然出现，所以每 N 帧才检测一次
+        self._yolo_every = 3
+        self._frame_idx = 0
+        self._last_has_phone = False
+        self._last_head_down = False
+        self._last_phone_time = 0.0
+        self._yolo_pool = ThreadPoolExecutor(max_workers=1)
+        # 人离开座位后画面基本不动，连续多帧没有人脸且画面静止时跳过人脸模型
+        self._prev_small = None
+        self._no_face_count = 0
+        self._motion_threshold = 2.0
+        # 缓存的检测结果最多沿用这么久，超时后强制重新检测
+        self._phone_ttl = 2.0
 
     def stop(self) -> None:
         self._stop_flag.set()
+        self._active.set()
+
+    def pause(self) -> None:
+        self._active.clear()
+
+    def resume(self) -> None:
+        self._active.set()
 
     def _init_models(self) -> None:
-        if mp_face_mesh:
+        load_vision_modules()
+        # 低头判断只用到眼、鼻、下巴/嘴几个点，默认用轻量的人脸检测模型，FaceMesh 按需开启
+        if mp_face_detection and not self._config.use_face_mesh:
             try:
-                self._face_mesh = mp_face_mesh.FaceMesh(
+                self._face_model = mp_face_detection.FaceDetection(
+                    model_selection=0,
+                    min_detection_confidence=0.5,
+                )
+                self._use_detection = True
+            except Exception as e:
+                self._mp_error = str(e)
+        elif self._init_face_landmarker():
+            # 只有 Tasks API、没有 mp.solutions 的 mediapipe 版本，未开启 FaceMesh 时也会走到这里
+            pass
+        elif mp_face_mesh:
+            try:
+                self._face_model = mp_face_mesh.FaceMesh(
                     static_image_mode=False,
                     max_num_faces=1,
-                    refine_landmarks=True,
-                    min_detection_confidence=0.5,
+                    refine_landmarks=False,
+                    min_detection_confidence=0.7,
                     min_tracking_confidence=0.5,
                 )
             except Exception as e:
                 self._mp_error = str(e)
         else:
             self._mp_error = MP_IMPORT_ERROR or "Mediapipe库未加载"
+        if self._use_detection:
+            self._head_down_threshold = self.HEAD_DOWN_THRESHOLD_DETECTION
 
         # YOLO 在打包后加载比较特殊，建议直接传绝对路径或者放在同一目录下
         # 这里尝试直接加载，如果失败则尝试相对路径
@@ -230,7 +436,7 @@ class CameraMonitor(QtCore.QThread):
         if YOLO:
             if weights.exists():
                 try:
-                    self._yolo = YOLO(str(weights))
+                    self._yolo = self._load_yolo(weights)
                 except Exception:
                     pass
             # 尝试去 _MEIPASS 找 (如果用户打包进去了)
@@ -238,89 +444,450 @@ class CameraMonitor(QtCore.QThread):
                 try:
                     bundled_path = get_resource_path(self._config.yolo_weights_path)
                     if os.path.exists(bundled_path):
-                        self._yolo = YOLO(bundled_path)
+                        self._yolo = self._load_yolo(Path(bundled_path))
                 except:
                     pass
 
-    def _calculate_ratio(self, landmarks):
-        lm = landmarks.landmark
-        nose = lm[1]
-        chin = lm[152]
-        eye_mid_y = (lm[33].y + lm[263].y) / 2.0
-        denom = (chin.y - eye_mid_y)
+        if self._yolo:
+            # YOLO 出问题时只关掉手机检测，不能连带人脸模型一起失效
+            try:
+                # 类别名到 id 的映射只算一次，推理时只需做整数集合判断
+                self._phone_cls_ids = {
+                    int(cid) for cid, name in self._yolo.names.items() if name in self.PHONE_NAMES
+                }
+                # 只有 TensorRT 引擎和原始权重在显卡上跑，OpenVINO/ONNX 的输出都在 CPU 上
+                on_gpu = self._yolo_backend in ("tensorrt", "pytorch") and torch.cuda.is_available()
+                self._yolo_device = "cuda:0" if on_gpu else "cpu"
+                self._yolo_half = self._yolo_device != "cpu"
+                self._phone_cls_tensor = torch.tensor(
+                    sorted(self._phone_cls_ids), dtype=torch.long, device=self._yolo_device
+                )
+            except Exception as e:
+                print(f"[模型] YOLO 初始化失败，手机检测已关闭: {e}")
+                self._yolo = None
+                self._phone_cls_ids = set()
+
+    def _load_yolo(self, weights: Path):
+        # 导出结果缓存在权重旁边，只在第一次加载时导出；auto 时按速度从快到慢依次尝试
+        backend = self._config.yolo_backend
+        candidates = self.YOLO_BACKENDS if backend == "auto" else (backend,)
+        for name in candidates:
+            model = self._load_backend(name, weights, auto=backend == "auto")
+            if model:
+                self._yolo_backend = name
+                return model
+        self._yolo_backend = "pytorch"
+        return YOLO(str(weights))
+
+    def _load_backend(self, name: str, weights: Path, auto: bool):
+        stem = f"{weights.stem}_{self.YOLO_IMGSZ}"
+        if name == "tensorrt":
+            # 有 NVIDIA 显卡时优先用 TensorRT 引擎，能用上 Tensor Core
+            if not (torch.cuda.is_available() and importlib.util.find_spec("tensorrt")):
+                return None
+            # 采集过本机摄像头的校准画面时，再进一步用 INT8 引擎（Tensor Core 上吞吐约为 FP16 的两倍）
+            int8_engine = weights.with_name(f"{stem}_int8.engine")
+            # INT8 构建失败过就不再每次启动都重试（可能要几分钟），重新采集校准画面时会清掉这个标记
+            int8_failed = weights.with_name(f"{stem}_int8.failed")
+            # 引擎已缓存时直接加载，只有需要导出时才去读类别名、写校准配置；
+            # 缓存引擎加载失败要重新导出时，沿用上次导出时写好的配置
+            if int8_engine.exists():
+                calib_yaml = Path(self._config.calib_dir).resolve() / "frames.yaml"
+            elif int8_failed.exists():
+                calib_yaml = None
+            else:
+                calib_yaml = self._write_calib_yaml(weights)
+            if calib_yaml:
+                model = self._load_exported(
+                    weights, int8_engine,
+                    format="engine", int8=True, data=str(calib_yaml), dynamic=False, batch=1,
+                )
+                if model:
+                    return model
+                int8_failed.touch()
+            return self._load_exported(
+                weights, weights.with_name(f"{stem}.engine"), format="engine", half=True, dynamic=False, batch=1
+            )
+        if name == "openvino_int8":
+            # INT8 在支持 VNNI 的 CPU 上延迟约减半；自动选择时老 CPU 跳过，手动指定则照用
+            if not importlib.util.find_spec("openvino") or (auto and not self._cpu_supports_int8()):
+                return None
+            return self._load_exported(
+                weights, weights.with_name(f"{stem}_int8_openvino_model"),
+                format="openvino", int8=True, data="coco128.yaml",
+            )
+        if name == "openvino":
+            # 没有 VNNI 时 OpenVINO FP32 在 Intel CPU 上也比 PyTorch 快 2 倍左右
+            if not importlib.util.find_spec("openvino"):
+                return None
+            return self._load_exported(weights, weights.with_name(f"{stem}_openvino_model"), format="openvino", half=False)
+        if name == "onnx":
+            # ONNX Runtime 省掉 PyTorch 每次调用的额外开销并做算子融合
+            if not importlib.util.find_spec("onnxruntime"):
+                return None
+            return self._load_exported(weights, weights.with_name(f"{stem}.onnx"), format="onnx", opset=17, simplify=True)
+        return None
+
+    def _write_calib_yaml(self, weights: Path):
+        """把主界面采集的校准画面写成 Ultralytics 数据集配置，没有画面时返回 None"""
+        calib_dir = Path(self._config.calib_dir).resolve()
+        images = calib_dir / "images"
+        if not images.is_dir() or not any(images.glob("*.jpg")):
+            return None
+        names = YOLO(str(weights)).names
+        lines = [f"path: {json.dumps(str(calib_dir))}", "train: images", "val: images", "names:"]
+        lines += [f"  {cid}: {json.dumps(name)}" for cid, name in names.items()]
+        calib_yaml = calib_dir / "frames.yaml"
+        calib_yaml.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return calib_yaml
+
+    def _load_exported(self, weights: Path, target: Path, **export_args):
+        # 导出的模型输入尺寸是固定的，文件名带上 imgsz，尺寸变了会重新导出
+        cached = target.exists()
+        if not cached:
+            try:
+                exported = YOLO(str(weights)).export(imgsz=self.YOLO_IMGSZ, **export_args)
+                Path(exported).rename(target)
+            except Exception as e:
+                print(f"[模型] {export_args['format']} 导出失败，改用下一个后端: {e}")
+                return None
+        try:
+            model = YOLO(str(target), task="detect")
+            # 导出格式是懒加载的，读一次 names 才会真正建立推理后端，反序列化失败等问题在这里暴露
+            model.names
+            return model
+        except Exception as e:
+            print(f"[模型] {target.name} 加载失败: {e}")
+        if not cached:
+            return None
+        # 缓存的引擎可能是旧版 TensorRT/OpenVINO 生成的，删掉重新导出一次
+        if target.is_dir():
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            target.unlink(missing_ok=True)
+        return self._load_exported(weights, target, **export_args)
+
+    @staticmethod
+    def _cpu_supports_int8() -> bool:
+        # 老 CPU 没有 VNNI 指令，INT8 算子会被退回 FP32，反而更慢
+        if not cpuinfo:
+            return False
+        try:
+            flags = set(cpuinfo.get_cpu_info().get("flags", []))
+        except Exception:
+            return False
+        return bool(flags & {"avx512_vnni", "avx512vnni", "avx_vnni", "avxvnni"})
+
+    def _init_face_landmarker(self) -> bool:
+        # 有 face_landmarker.task 模型时用 Tasks API 的 FaceLandmarker，可以走 GPU (OpenGL/Metal) 推理；
+        # GPU delegate 不可用时退回 CPU，再不行就用旧的 FaceMesh
+        if not mp_vision:
+            return False
+        model_path = Path(self._config.face_landmarker_path)
+        if not model_path.exists():
+            model_path = Path(get_resource_path(self._config.face_landmarker_path))
+            if not model_path.exists():
+                return False
+        base_options = mp.tasks.BaseOptions
+        for delegate in (base_options.Delegate.GPU, base_options.Delegate.CPU):
+            try:
+                options = mp_vision.FaceLandmarkerOptions(
+                    base_options=base_options(model_asset_path=str(model_path), delegate=delegate),
+                    running_mode=mp_vision.RunningMode.VIDEO,
+                    num_faces=1,
+                    output_face_blendshapes=False,
+                )
+                self._landmarker = mp_vision.FaceLandmarker.create_from_options(options)
+                self._face_model = self._landmarker
+                return True
+            except Exception as e:
+                self._mp_error = str(e)
+        return False
+
+    def _process_face(self, rgb):
+        if self._landmarker:
+            # VIDEO 模式要求时间戳严格递增
+            ts = max(int(time.monotonic() * 1000), self._last_landmarker_ts + 1)
+            self._last_landmarker_ts = ts
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            return self._landmarker.detect_for_video(image, ts)
+        return self._face_model.process(rgb)
+
+    def _calculate_ratio(self, lm):
+        nose_y, chin_y, left_eye_y, right_eye_y = [lm[i].y for i in self._LM_IDX]
+        eye_mid_y = 0.5 * (left_eye_y + right_eye_y)
+        denom = chin_y - eye_mid_y
+        if denom <= 0: return 0.0
+        return (nose_y - eye_mid_y) / denom
+
+    def _calculate_detection_ratio(self, detection):
+        kp = detection.location_data.relative_keypoints
+        right_eye, left_eye, nose, mouth = kp[0], kp[1], kp[2], kp[3]
+        eye_mid_y = 0.5 * (left_eye.y + right_eye.y)
+        denom = mouth.y - eye_mid_y
         if denom <= 0: return 0.0
         return (nose.y - eye_mid_y) / denom
 
+    def _face_ratio(self, res):
+        """返回低头比例，没检测到人脸时返回 None"""
+        if self._landmarker:
+            return self._calculate_ratio(res.face_landmarks[0]) if res.face_landmarks else None
+        if not self._use_detection:
+            return self._calculate_ratio(res.multi_face_landmarks[0].landmark) if res.multi_face_landmarks else None
+        return self._calculate_detection_ratio(res.detections[0]) if res.detections else None
+
+    def _is_head_down(self, res):
+        """返回 (是否检测到人脸, 是否低头)"""
+        ratio = self._face_ratio(res)
+        if ratio is None:
+            return False, False
+        if len(self._baseline_ratios) < self._baseline_frames:
+            self._update_baseline(ratio)
+            return True, False
+        return True, ratio > self._head_down_threshold
+
+    def _update_baseline(self, ratio: float) -> None:
+        self._baseline_ratios.append(ratio)
+        if len(self._baseline_ratios) < self._baseline_frames:
+            return
+        # 阈值只往上调，且最多调到默认值的 1.3 倍：开局就低着头时基线本身偏高，这种情况保持默认阈值
+        default = self._head_down_threshold
+        calibrated = float(np.median(self._baseline_ratios)) + default * 0.25
+        if calibrated <= default * 1.3:
+            self._head_down_threshold = max(default, calibrated)
+        self._log.append(f"[阈值校准] 基线 {np.median(self._baseline_ratios):.3f}，低头阈值 {self._head_down_threshold:.3f}")
+
     def _phone_detected(self, frame) -> bool:
-        if not self._yolo: return False
-        results = self._yolo(frame, conf=0.4, iou=0.5, verbose=False)
+        if not self._yolo or not self._phone_cls_ids: return False
+        # 只保留手机类别，NMS 不再处理其余 79 个类；416 输入比默认 640 少一半多的计算量
+        results = self._yolo(
+            frame,
+            imgsz=self.YOLO_IMGSZ,
+            conf=0.4,
+            iou=0.5,
+            classes=sorted(self._phone_cls_ids),
+            half=self._yolo_half,
+            device=self._yolo_device,
+            verbose=False,
+        )
         for result in results:
             if not hasattr(result, "boxes"): continue
-            names = result.names
-            for cls_id in result.boxes.cls.tolist():
-                name = names.get(int(cls_id), "")
-                if name in {"cell phone", "phone", "mobile phone"}:
-                    return True
+            # 在 torch 内部完成类别判断，不把检测框逐个搬到 Python
+            cls = result.boxes.cls.long()
+            if torch.isin(cls, self._phone_cls_tensor.to(cls.device)).any():
+                return True
         return False
 
     def run(self) -> None:
         self._init_models()
-        if not self._face_mesh:
+        # 人脸模型、YOLO、OpenCV 默认都按核数开线程，同时跑会互相抢核，各自限制一下
+        cv2.setNumThreads(2)
+        if torch:
+            torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        if self._stop_flag.is_set():
+            return
+        if not self._face_model:
             self.status.emit(f"错误: {self._mp_error}")
             return
+        self._warm_up()
+        if self._stop_flag.is_set():
+            return
 
-        cap = cv2.VideoCapture(self._config.camera_index)
+        cap = self._shared_cap or open_camera(self._config.camera_index)
         if not cap.isOpened():
             self.status.emit(f"无法打开摄像头 {self._config.camera_index}")
             return
 
+        # 模型内部都会缩放到更小的尺寸，直接按 640x360 采集（多数笔记本摄像头是 16:9）可以省掉大量无用的像素拷贝
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.FRAME_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.FRAME_HEIGHT)
+
         print(f"[监测线程] 已启动，使用摄像头 {self._config.camera_index}")
+
+        # 采集放到单独线程，推理期间驱动缓冲区不会堆积旧帧；队列只放一帧，即“最新帧”槽位
+        frames = queue.Queue(maxsize=1)
+        reader = threading.Thread(target=self._read_loop, args=(cap, frames), daemon=True)
+        reader.start()
+
         last_frame_time = 0.0
 
         while not self._stop_flag.is_set():
-            ok, frame = cap.read()
-            if not ok:
-                time.sleep(0.1)
+            if not self._active.is_set():
+                self._active.wait()
+                # 暂停期间的缓存结果都已过时，恢复后从整帧重新检测
+                self._face_roi = None
+                self._last_has_phone = False
+                self._last_head_down = False
+                self._last_phone_time = 0.0
+                self._prev_small = None
+                self._no_face_count = 0
                 continue
 
+            # 按帧间隔节拍休眠；冷却期内即使检测到也不会再提醒，直接睡到冷却结束
             now = time.time()
-            if now - last_frame_time < 0.2:
+            wait = max(
+                self._frame_interval - (now - last_frame_time),
+                self._last_prompt_time + self._config.prompt_cooldown - now,
+            )
+            if wait > 0 and self._stop_flag.wait(wait):
+                break
+
+            self._frame_wanted.set()
+            try:
+                frame = frames.get(timeout=0.5)
+            except queue.Empty:
                 continue
+
+            now = time.time()
             last_frame_time = now
 
+            # 按宽度等比缩到 YOLO 的输入尺寸（16:9 画面即 416x234），Ultralytics 内部就不用再缩放，
+            # 颜色转换和人脸模型处理的像素也少一半多；归一化坐标算出的低头比例不受影响
+            h, w = frame.shape[:2]
+            if w > self.INFER_WIDTH:
+                size = (self.INFER_WIDTH, round(h * self.INFER_WIDTH / w))
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
             try:
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                res = self._face_mesh.process(rgb)
+                # 连续多帧没有人脸且画面静止时跳过人脸模型；低头看手机时人脸也可能检测不到，
+                # 所以 YOLO 仍按原来的节拍检测
+                face_idle = self._scene_static(frame) and self._no_face_count > 5
+
+                # 轮到 YOLO 的帧，和人脸模型并行跑（两者推理时都会释放 GIL）；
+                # 上一帧还在低头时大概率这一帧也低头，用不上 YOLO 的结果，就等人脸结果出来再决定
+                phone_future = None
+                yolo_due = False
+                if self._yolo:
+                    self._frame_idx += 1
+                    yolo_due = (self._frame_idx % self._yolo_every == 0
+                                or now - self._last_phone_time >= self._phone_ttl)
+                    if yolo_due and not self._last_head_down:
+                        phone_future = self._yolo_pool.submit(self._phone_detected, frame)
 
-                is_head_down = False
                 has_phone = False
-
-                if res.multi_face_landmarks:
-                    ratio = self._calculate_ratio(res.multi_face_landmarks[0])
-                    if ratio > self.HEAD_DOWN_THRESHOLD:
-                        is_head_down = True
-
-                if self._yolo and (not is_head_down):
-                    if self._phone_detected(frame):
-                        has_phone = True
+                if face_idle:
+                    face_found, is_head_down = False, False
+                else:
+                    # 只转换上一帧人脸附近的区域；RGB 缓冲区按整帧大小只分配一次，
+                    # 裁剪区域取它开头的一段重新 reshape，保证是连续内存
+                    face_bgr, roi = self._face_crop(frame)
+                    ch, cw = face_bgr.shape[:2]
+                    if self._rgb_buffer is None or self._rgb_buffer.size < frame.size:
+                        self._rgb_buffer = np.empty(frame.size, dtype=np.uint8)
+                    rgb = self._rgb_buffer[:ch * cw * 3].reshape(ch, cw, 3)
+                    cv2.cvtColor(face_bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+
+                    res = self._process_face(rgb)
+                    face_found, is_head_down = self._is_head_down(res)
+                    self._update_face_roi(res, roi, frame.shape)
+                    self._no_face_count = 0 if face_found else self._no_face_count + 1
+                self._last_head_down = is_head_down
+
+                if phone_future:
+                    self._last_has_phone = phone_future.result()
+                    self._last_phone_time = now
+                elif self._yolo and not is_head_down and (yolo_due or not (face_found or face_idle)):
+                    # 没检测到人脸时人脸模型帮不上忙，立即用 YOLO 补一次；上面因低头推迟的检测也在这里补上
+                    self._last_has_phone = self._phone_detected(frame)
+                    self._last_phone_time = now
+                if self._yolo and not is_head_down:
+                    has_phone = self._last_has_phone
 
                 trigger = is_head_down or has_phone
 
                 if trigger:
                     if now - self._last_prompt_time >= self._config.prompt_cooldown:
                         self._last_prompt_time = now
-                        print(f"[触发警告] 低头: {is_head_down}, 手机: {has_phone}")
+                        self._log.append(f"[触发警告] {time.strftime('%H:%M:%S')} 低头: {is_head_down}, 手机: {has_phone}")
                         self.prompt_needed.emit(self._config.prompt_text)
 
             except Exception:
                 pass
 
-        cap.release()
+        reader.join(timeout=1.0)
+        self._yolo_pool.shutdown(wait=True)
+        if cap is not self._shared_cap:
+            cap.release()
+        self._flush_log()
         print("[监测线程] 已退出")
 
+    def _scene_static(self, frame) -> bool:
+        # 先缩到 64x48 再转灰度，和上一帧比较平均差值，开销只有几百微秒
+        small = cv2.cvtColor(cv2.resize(frame, (64, 48), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        prev, self._prev_small = self._prev_small, small
+        return prev is not None and cv2.absdiff(small, prev).mean() < self._motion_threshold
+
+    def _face_crop(self, frame):
+        self._roi_frame_idx += 1
+        h, w = frame.shape[:2]
+        # 每隔一段时间回到整帧检测一次，防止人脸移出裁剪区后一直找不回来
+        if self._face_roi is None or self._roi_frame_idx % self._roi_refresh_every == 0:
+            return frame, (0, 0, w, h)
+        x0, y0, x1, y1 = self._face_roi
+        return frame[y0:y1, x0:x1], self._face_roi
+
+    def _update_face_roi(self, res, roi, frame_shape) -> None:
+        # FaceMesh 自带基于上一帧关键点的跟踪，手动裁剪反而会打乱它，所以只对人脸检测模型用 ROI；
+        # 低头比例只依赖纵坐标的相对位置，在裁剪图上算出来和整帧一致，不需要换算回去
+        if not self._use_detection or not res.detections:
+            self._face_roi = None
+            return
+        x0, y0, x1, y1 = roi
+        cw, ch = x1 - x0, y1 - y0
+        h, w = frame_shape[:2]
+        bb = res.detections[0].location_data.relative_bounding_box
+        mx, my = bb.width * self._roi_margin, bb.height * self._roi_margin
+        nx0 = max(0, int(x0 + (bb.xmin - mx) * cw))
+        ny0 = max(0, int(y0 + (bb.ymin - my) * ch))
+        nx1 = min(w, int(x0 + (bb.xmin + bb.width + mx) * cw))
+        ny1 = min(h, int(y0 + (bb.ymin + bb.height + my) * ch))
+        if nx1 - nx0 < 32 or ny1 - ny0 < 32:
+            self._face_roi = None
+        else:
+            self._face_roi = (nx0, ny0, nx1, ny1)
+
+    def _warm_up(self) -> None:
+        # 首次推理要建图、初始化线程池，先用一张黑图跑一遍，避免开始专注后的第一秒漏检
+        dummy = np.zeros((round(self.FRAME_HEIGHT * self.INFER_WIDTH / self.FRAME_WIDTH), self.INFER_WIDTH, 3), dtype=np.uint8)
+        try:
+            self._process_face(dummy)
+            self._phone_detected(dummy)
+        except Exception:
+            pass
+
+    def _flush_log(self) -> None:
+        while self._log:
+            print(self._log.popleft())
+
+    def _read_loop(self, cap, frames: queue.Queue) -> None:
+        while not self._stop_flag.is_set():
+            if not self._active.is_set():
+                self._active.wait()
+                continue
+            # grab 只推进视频流不解码，推理线程要帧时才解码最新的一帧
+            if not cap.grab():
+                time.sleep(0.1)
+                continue
+            if not self._frame_wanted.is_set():
+                continue
+            # 解码到预分配的帧缓冲里，两块轮流用；推理线程处理完上一帧才会要新帧，不会读写冲突
+            slot = self._slot_idx = (self._slot_idx + 1) % len(self._frame_slots)
+            ok, frame = cap.retrieve(self._frame_slots[slot])
+            if not ok:
+                continue
+            self._frame_slots[slot] = frame
+            self._frame_wanted.clear()
+            try:
+                frames.put_nowait(frame)
+            except queue.Full:
+                pass
+
 
 # --- 主窗口 ---
 class MainWindow(QtWidgets.QMainWindow):
+    CALIB_FRAMES = 100
+    cameras_scanned = QtCore.Signal(list)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("HeadsUp - 专注卫士")
@@ -345,44 +912,69 @@ class MainWindow(QtWidgets.QMainWindow):
         self._config = AppConfig()
 
         self._remaining = 0
+        self._phase_end = 0.0
         self._is_break_mode = False
 
+        # 倒计时按单调时钟计算剩余时间，定时器只负责在每个整秒边界唤醒一次，不会累积漂移
         self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.CoarseTimer)
         self._timer.timeout.connect(self._on_tick)
         self._floating = FloatingTimer()
         self._monitor = None
+        self._stopping_monitor = None
         self._prompter = VoicePrompter()
 
         self._preview_timer = QtCore.QTimer(self)
         self._preview_timer.timeout.connect(self._update_preview)
-        self._preview_cap = None
+        # 预览打开的摄像头会直接交给监测线程复用，避免重新打开
+        self._cap = None
+        self._cap_index = None
         self._is_previewing = False
         self._camera_verified = False
+        self._calib_remaining = 0
+        self._calib_index = 0
 
         self._build_ui()
         self._apply_style()
         self._init_tray()
 
-        self._scan_cameras()
+        # 探测摄像头要等驱动，放到后台线程里做，结果通过信号排队回主线程填进下拉框
+        self.camera_combo.addItem("正在检测摄像头...", None)
+        self.preview_btn.setEnabled(False)
+        self.cameras_scanned.connect(self._on_cameras_scanned, QtCore.Qt.QueuedConnection)
+        threading.Thread(target=self._scan_cameras, daemon=True).start()
 
     def _scan_cameras(self):
+        # 每个摄像头打开都要等驱动几百毫秒，并行探测
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            self.cameras_scanned.emit(list(pool.map(self._probe_camera, range(3))))
+
+    @QtCore.Slot(list)
+    def _on_cameras_scanned(self, results):
         self.camera_combo.clear()
         found = False
-        for i in range(3):
-            temp = cv2.VideoCapture(i)
-            if temp.isOpened():
-                ret, _ = temp.read()
-                if ret:
-                    self.camera_combo.addItem(f"摄像头 {i}", i)
-                    found = True
-            temp.release()
+        for i, ok in results:
+            if ok:
+                self.camera_combo.addItem(f"摄像头 {i}", i)
+                found = True
 
         if not found:
             self.camera_combo.addItem("未检测到摄像头", -1)
             self.preview_btn.setEnabled(False)
         else:
+            self.preview_btn.setEnabled(True)
             self.camera_combo.setCurrentIndex(0)
 
+    @staticmethod
+    def _probe_camera(index):
+        temp = open_camera(index)
+        ok = False
+        if temp.isOpened():
+            ok, _ = temp.read()
+        temp.release()
+        return index, ok
+
     def _toggle_preview(self):
         if self._is_previewing:
             self._stop_preview()
@@ -393,11 +985,15 @@ class MainWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.warning(self, "错误", "没有可用的摄像头")
                 return
 
-            self._preview_cap = cv2.VideoCapture(idx)
-            if self._preview_cap.isOpened():
+            self._release_camera()
+            self._cap = open_camera(idx)
+            self._cap_index = idx
+            if self._cap.isOpened():
                 self._is_previewing = True
-                self._preview_timer.start(30)
+                # open_camera 按 15 fps 采集，刷新再快只会让 read() 在 UI 线程上干等下一帧
+                self._preview_timer.start(66)
                 self.preview_btn.setText("停止预览")
+                self.calib_btn.setEnabled(True)
                 self.monitor_status.setText("正在预览画面...")
 
                 self._camera_verified = True
@@ -413,31 +1009,75 @@ class MainWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.critical(self, "错误", "无法打开该摄像头，请选择其他设备。")
 
     def _update_preview(self):
-        if self._preview_cap and self._preview_cap.isOpened():
-            ret, frame = self._preview_cap.read()
+        if self._cap and self._cap.isOpened():
+            ret, frame = self._cap.read()
             if ret:
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                if self._calib_remaining:
+                    self._save_calib_frame(frame)
+                # 先用 cv2 按比例缩到预览区大小，再构造 QImage，省掉 UI 线程上的平滑缩放
+                h, w = frame.shape[:2]
+                scale = min(self.preview_label.width() / w, self.preview_label.height() / h)
+                frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_LINEAR)
+                # QImage 直接按 BGR 解释像素，省掉一次整帧的颜色转换
                 h, w, ch = frame.shape
                 bytes_per_line = ch * w
-                qt_img = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qt_img).scaled(
-                    self.preview_label.size(),
-                    QtCore.Qt.KeepAspectRatio,
-                    QtCore.Qt.SmoothTransformation
-                )
-                self.preview_label.setPixmap(pixmap)
+                qt_img = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888)
+                self.preview_label.setPixmap(QPixmap.fromImage(qt_img))
             else:
                 self.monitor_status.setText("摄像头读取失败")
 
-    def _stop_preview(self):
+    def _stop_preview(self, release: bool = True):
         self._preview_timer.stop()
-        if self._preview_cap:
-            self._preview_cap.release()
-            self._preview_cap = None
+        self._calib_remaining = 0
+        self.calib_btn.setEnabled(False)
+        self.calib_btn.setText("采集 INT8 校准画面")
+        if release:
+            self._release_camera()
         self._is_previewing = False
         self.preview_label.clear()
         self.preview_label.setText("摄像头预览区\n(请点击下方按钮测试)")
 
+    def _start_calib_capture(self):
+        # 用预览中的实时画面作为 TensorRT INT8 的校准数据，比通用数据集更贴近实际场景
+        # 先写到临时目录，采满后才替换旧画面；中途停止预览不会留下不完整的校准集
+        pending = Path(self._config.calib_dir) / "images.tmp"
+        shutil.rmtree(pending, ignore_errors=True)
+        pending.mkdir(parents=True)
+        self._calib_index = 0
+        self._calib_remaining = self.CALIB_FRAMES
+        self.calib_btn.setEnabled(False)
+
+    def _save_calib_frame(self, frame):
+        # 预览 15fps，每 3 帧存一张（约 5 张/秒，采满 100 张约 20 秒），避免画面几乎一样
+        self._calib_index += 1
+        if self._calib_index % 3:
+            return
+        calib_dir = Path(self._config.calib_dir)
+        n = self.CALIB_FRAMES - self._calib_remaining
+        cv2.imwrite(str(calib_dir / "images.tmp" / f"{n:03d}.jpg"), frame)
+        self._calib_remaining -= 1
+        self.calib_btn.setText(f"校准画面采集中 {n + 1}/{self.CALIB_FRAMES}")
+        if not self._calib_remaining:
+            shutil.rmtree(calib_dir / "images", ignore_errors=True)
+            (calib_dir / "images.tmp").rename(calib_dir / "images")
+            # 旧的 INT8 引擎是用旧画面校准的，删掉让下次启动重新导出
+            weights = Path(self.model_path_input.text().strip())
+            for engine in weights.parent.glob(f"{weights.stem}_*_int8.engine"):
+                engine.unlink()
+            for marker in weights.parent.glob(f"{weights.stem}_*_int8.failed"):
+                marker.unlink()
+            # Ultralytics 的 INT8 校准器会优先读取已有的校准表，不删掉的话新画面不会生效
+            weights.with_suffix(".cache").unlink(missing_ok=True)
+            self.calib_btn.setText("采集 INT8 校准画面")
+            self.calib_btn.setEnabled(True)
+            self.monitor_status.setText("校准画面已采集，下次开始专注时生成 INT8 引擎")
+
+    def _release_camera(self):
+        if self._cap:
+            self._cap.release()
+            self._cap = None
+            self._cap_index = None
+
     def _browse_weights(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
             self, "选择模型", "", "Model (*.pt)"
@@ -447,7 +1087,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_start(self):
         if self._is_previewing:
-            self._stop_preview()
+            self._stop_preview(release=False)
             self.preview_btn.setText("测试/预览摄像头")
 
         self._config.focus_minutes = self.focus_min_input.value()
@@ -465,14 +1105,32 @@ class MainWindow(QtWidgets.QMainWindow):
         self.model_path_input.setEnabled(False)
         self.browse_btn.setEnabled(False)
 
+        if self._cap_index != self._config.camera_index:
+            self._release_camera()
+
         self._floating.show()
         self._start_focus_phase()
-        self._timer.start(1000)
+        self._schedule_tick()
 
     def _on_stop(self):
         self._timer.stop()
         self._floating.hide()
-        self._stop_monitor_cleanly()
+        self.stop_button.setEnabled(False)
+        if self._stop_monitor_cleanly():
+            self._finish_stop()
+        else:
+            self.monitor_status.setText("正在停止监测...")
+
+    @QtCore.Slot()
+    def _on_stopping_monitor_finished(self):
+        # 线程退出前 _on_stop 里可能已经判断过 isFinished，这里只处理一次
+        if self._stopping_monitor is None:
+            return
+        self._stopping_monitor = None
+        self._finish_stop()
+
+    def _finish_stop(self):
+        self._release_camera()
 
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
@@ -486,41 +1144,80 @@ class MainWindow(QtWidgets.QMainWindow):
     def _start_focus_phase(self):
         self._is_break_mode = False
         self._remaining = self._config.focus_minutes * 60 + self._config.focus_seconds
+        self._phase_end = time.monotonic() + self._remaining
         self._update_countdown_label()
         self._prompter.speak("开始专注")
 
+        if self._monitor and self._monitor.isRunning():
+            self._monitor.resume()
+            self.monitor_status.setText("AI监测运行中...")
+            return
+        # 上一轮的线程因模型或摄像头出错已经退出时，重新创建一个，让错误能再次显示出来
+        self._monitor = None
         if self._config.enable_monitor:
-            self._monitor = CameraMonitor(self._config)
-            self._monitor.prompt_needed.connect(lambda t: self._prompter.speak(t))
-            self._monitor.status.connect(lambda s: self.monitor_status.setText(s))
+            cap = self._cap if self._cap and self._cap.isOpened() else None
+            self._monitor = CameraMonitor(self._config, cap=cap)
+            # 显式排队到主线程执行：连 lambda 时 PySide 可能直接在监测线程里调用，既不安全又会拖慢推理
+            self._monitor.prompt_needed.connect(self._on_prompt, QtCore.Qt.QueuedConnection)
+            self._monitor.status.connect(self._on_monitor_status, QtCore.Qt.QueuedConnection)
             self._monitor.start()
             self.monitor_status.setText("AI监测运行中...")
         else:
             self.monitor_status.setText("监测未开启")
 
+    @QtCore.Slot(str)
+    def _on_prompt(self, text):
+        self._prompter.speak(text)
+
+    @QtCore.Slot(str)
+    def _on_monitor_status(self, text):
+        self.monitor_status.setText(text)
+
     def _start_break_phase(self):
         self._is_break_mode = True
         self._remaining = self._config.break_minutes * 60 + self._config.break_seconds
+        self._phase_end = time.monotonic() + self._remaining
         self._update_countdown_label()
         self._prompter.speak("休息时间可以玩手机了")
-        self._stop_monitor_cleanly()
+        if self._monitor:
+            self._monitor.pause()
         self.monitor_status.setText("休息中 (监测暂停)")
 
-    def _stop_monitor_cleanly(self):
-        if self._monitor:
-            self._monitor.stop()
-            self._monitor.wait(500)
-            self._monitor = None
+    def _stop_monitor_cleanly(self) -> bool:
+        """停止监测线程，2 秒内没有退出时返回 False"""
+        if not self._monitor:
+            return True
+        monitor, self._monitor = self._monitor, None
+        monitor.stop()
+        monitor.prompt_needed.disconnect(self._on_prompt)
+        monitor.status.disconnect(self._on_monitor_status)
+        # 摄像头可能是共享的，要等线程真正退出后才能安全释放
+        if monitor.wait(2000):
+            return True
+        # 首次导出 TensorRT/INT8 引擎时 _init_models 可能要跑好几分钟；线程退出前不能释放摄像头，
+        # 也不能再启动新的监测去争同一个导出文件，等 finished 信号再收尾
+        self._stopping_monitor = monitor
+        monitor.finished.connect(self._on_stopping_monitor_finished, QtCore.Qt.QueuedConnection)
+        if monitor.isFinished():
+            self._on_stopping_monitor_finished()
+        return False
 
     def _on_tick(self):
-        self._remaining -= 1
-        if self._remaining <= 0:
+        remaining = max(0, math.ceil(self._phase_end - time.monotonic() - 0.001))
+        if remaining <= 0:
             if not self._is_break_mode:
                 self._start_break_phase()
             else:
                 self._start_focus_phase()
-        else:
+        elif remaining != self._remaining:
+            self._remaining = remaining
             self._update_countdown_label()
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        left = self._phase_end - time.monotonic()
+        # 定到下一个整秒边界之后一点点；时长为 0 的阶段按 1 秒处理，避免来回快速切换
+        self._timer.start(int((left % 1.0) * 1000) + 5 if left > 0 else 1000)
 
     def _update_countdown_label(self):
         m, s = divmod(self._remaining, 60)
@@ -556,9 +1253,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.activateWindow()
 
     def _on_force_quit(self):
-        self._stop_monitor_cleanly()
-        if self._is_previewing:
-            self._stop_preview()
+        if self._stop_monitor_cleanly():
+            if self._is_previewing:
+                self._stop_preview()
+            self._release_camera()
         self.tray.hide()
         os._exit(0)
 
@@ -591,6 +1289,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.preview_btn = QtWidgets.QPushButton("测试/预览摄像头")
         self.preview_btn.clicked.connect(self._toggle_preview)
 
+        self.calib_btn = QtWidgets.QPushButton("采集 INT8 校准画面")
+        self.calib_btn.setToolTip("预览时采集画面，用于在 NVIDIA 显卡上生成 INT8 TensorRT 引擎")
+        self.calib_btn.setEnabled(False)
+        self.calib_btn.clicked.connect(self._start_calib_capture)
+
         preview_container = QtWidgets.QHBoxLayout()
         preview_container.addStretch()
         preview_container.addWidget(self.preview_label)
@@ -610,6 +1313,7 @@ class MainWindow(QtWidgets.QMainWindow):
         cam_layout.addWidget(self.camera_combo)
         cam_layout.addLayout(preview_container)
         cam_layout.addWidget(self.preview_btn)
+        cam_layout.addWidget(self.calib_btn)
         cam_layout.addSpacing(10)
         cam_layout.addLayout(model_layout)
 
@@ -662,25 +1366,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setCentralWidget(scroll)
 
     def _apply_style(self):
-        self.setStyleSheet("""
-            QWidget { background-color: #fff6ef; color: #3d2b1f; font-family: "Microsoft YaHei UI"; font-size: 14px; }
-            #title { font-size: 22px; font-weight: bold; margin-bottom: 10px; }
-            QGroupBox { border: 1px solid #f0c6a8; border-radius: 8px; margin-top: 10px; padding-top: 15px; font-weight: bold; }
-            QLineEdit, QSpinBox, QComboBox { background: #fff1e8; border: 1px solid #f2b48f; border-radius: 5px; min-height: 30px; padding: 0 5px; }
-            QPushButton { background: #f08a5d; color: white; border-radius: 5px; min-height: 38px; font-weight: bold; }
-            QPushButton:disabled { background: #e0c0b0; color: #fff; }
-            #status { color: #d35400; font-weight: bold; margin-top: 5px; }
-        """)
+        self.setStyleSheet(MAIN_STYLE)
 
 
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
 
-    timer = QtCore.QTimer()
-    timer.timeout.connect(lambda: None)
-    timer.start(200)
-
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file